@@ -8,6 +8,7 @@
 #   - Install this file into your KiCad user plugin folder
 #   - In PCB Editor, go to Tools → External Plugins → Rename field…
 #   - A dialog will let you type the old field name and the new one
+#     (plus optional extra old/new pairs, applied in the same pass)
 #   - The plugin will update every footprint on the current board
 #
 # Author: Patrice Vigier (MIT License)
@@ -15,10 +16,51 @@
 import pcbnew
 import wx
 import os
+from functools import lru_cache
 
-def _rename_fields_on_board(board, old_field, new_field):
+# Byte-level a-z translation table for the ASCII fast path in _norm().
+_ASCII_LOWER = bytes.maketrans(bytes(range(0x41, 0x5B)), bytes(range(0x61, 0x7B)))
+
+
+@lru_cache(maxsize=4096)
+def _norm(s):
     """
-    Rename old_field -> new_field on all footprints in the given board.
+    Normalize a field/property name for case-insensitive comparison.
+
+    Field names are almost always pure ASCII ("MPN", "PART NUMBER"), so
+    lowercase those through a precomputed byte table, which is much cheaper
+    than the full Unicode tables. Anything non-ASCII falls back to casefold().
+
+    Boards draw field names from a small vocabulary, so results are memoized:
+    after the first encounter a name costs a single dict hit.
+    """
+    s = (s or "").strip()
+    if s.isascii():
+        return s.encode("ascii").translate(_ASCII_LOWER).decode("ascii")
+    return s.casefold()
+
+
+def _freeze_main_frame():
+    """
+    Freeze the PCB editor frame so the canvas is not repainted while we
+    mutate footprints. Returns the frame (for Thaw), or None on builds
+    that do not expose GetMainFrame().
+    """
+    try:
+        frame = pcbnew.GetMainFrame()
+        frame.Freeze()
+        return frame
+    except Exception:
+        return None
+
+
+def _rename_many_on_board(board, renames):
+    """
+    Apply several field renames to all footprints in a single board pass.
+
+    renames maps old field name -> new field name; matching is
+    case-insensitive (see _norm). One pass, one Freeze/Thaw, one Refresh,
+    however many renames are requested.
 
     Supports two APIs, depending on how the field is stored:
       A) Properties (GetProperties / SetProperty / ClearProperty)
@@ -26,92 +68,188 @@ def _rename_fields_on_board(board, old_field, new_field):
 
     Returns:
       count_modified: number of footprints actually changed
-      count_found: total number of footprints where the old_field was found
+      count_found: total number of occurrences of the old names found
     """
-    old_l = (old_field or "").strip().lower()  # normalized lowercase match
+    # Normalized old name -> new name, resolved with one dict lookup per key
+    rename_cf = {_norm(old): new for old, new in renames.items() if _norm(old)}
     count_modified = 0
     count_found = 0
-
-    # Iterate through every footprint on the board
-    for fp in board.GetFootprints():
-
-        # ---------- CASE A: Property dictionary ----------
-        try:
-            props = fp.GetProperties()  # Some builds may not support this
-            match_key = None
-            for k in list(props.keys()):
-                if (k or "").strip().lower() == old_l:
-                    match_key = k
-                    break
-
-            if match_key is not None:
-                # Found a match
-                count_found += 1
-                value = props[match_key]
-
-                # Create or overwrite the new property
-                try:
-                    fp.SetProperty(new_field, value)
-                except AttributeError:
-                    # Fallback if SetProperty is missing
-                    props[new_field] = value
-
-                # Remove the old property
-                try:
-                    fp.ClearProperty(match_key)
-                except Exception:
+    if not rename_cf:
+        return count_modified, count_found
+    n_renames = len(rename_cf)
+
+    # Field accessors resolved once from the field class on first use; every
+    # field on a board is the same pcbnew type, so there is no need for a
+    # getattr() plus fallback lambda on every single field.
+    _get_name = None
+    _get_text = None
+
+    # Materialize the footprint list once: GetFootprints() crosses the SWIG
+    # boundary and iterating the wrapper may re-query per step on some builds
+    footprints = list(board.GetFootprints())
+
+    # Probe the API surface on the first footprint only: all footprints are
+    # the same pcbnew type, and raising AttributeError per footprint is
+    # expensive (CPython allocates a traceback each time)
+    has_props = bool(footprints) and hasattr(footprints[0], "GetProperties")
+    has_set_props = bool(footprints) and hasattr(footprints[0], "SetProperties")
+    has_fields = bool(footprints) and hasattr(footprints[0], "GetFields")
+
+    # The frame is frozen lazily, just before the first mutation: a scan
+    # that matches nothing (e.g. a typo in the old field name) then costs
+    # no UI work at all — no Freeze/Thaw, no dirty flag, no Refresh
+    frame = None
+    frozen = False
+
+    try:
+        # Iterate through every footprint on the board
+        for fp in footprints:
+
+            # ---------- CASE A: Property dictionary ----------
+            prop_matches = {}
+            if has_props:
+                props = fp.GetProperties()
+                # Collect every requested rename present on this footprint:
+                # one dict lookup per key, whatever the number of renames
+                for k in props:
+                    new_name = rename_cf.get(_norm(k))
+                    if new_name is not None:
+                        prop_matches[k] = new_name
+
+                if prop_matches:
+                    count_found += len(prop_matches)
+                    if not frozen:
+                        frame = _freeze_main_frame()
+                        frozen = True
+
+                    if has_set_props:
+                        # Rebuild the property map with the keys renamed and
+                        # write it back in a single call — one SWIG crossing
+                        # for all renames on this footprint. Untouched entries
+                        # go in first, then the renamed values, so a rename
+                        # onto an already-existing key overwrites it (same
+                        # "create or overwrite" semantics as the fallback)
+                        new_props = {k: v for k, v in props.items()
+                                     if k not in prop_matches}
+                        for match_key, new_name in prop_matches.items():
+                            new_props[new_name] = props[match_key]
+                        fp.SetProperties(new_props)
+                    else:
+                        for match_key, new_name in prop_matches.items():
+                            value = props[match_key]
+
+                            # Create or overwrite the new property
+                            try:
+                                fp.SetProperty(new_name, value)
+                            except AttributeError:
+                                # Fallback if SetProperty is missing
+                                props[new_name] = value
+
+                            # Remove the old property
+                            try:
+                                fp.ClearProperty(match_key)
+                            except Exception:
+                                try:
+                                    del props[match_key]
+                                except Exception:
+                                    pass
+
+                    count_modified += 1
+                    # Count distinct renames satisfied here, not matched
+                    # keys: property maps are case-sensitive, so several
+                    # keys ("MPN", "mpn") can match one and the same rename
+                    done_cf = {_norm(k) for k in prop_matches}
+                    if len(done_cf) == n_renames:
+                        continue  # Every rename matched as a property
+
+            # ---------- CASE B: Fields (textual named fields) ----------
+            # Only the renames not already applied as properties on this
+            # footprint are still candidates here
+            fields = fp.GetFields() if has_fields else []
+
+            if prop_matches:
+                pending = {cf: new for cf, new in rename_cf.items()
+                           if cf not in done_cf}
+            else:
+                pending = rename_cf
+            # Normalized names satisfied so far — duplicate fields with the
+            # same name all get renamed but only satisfy one rename
+            field_done = set()
+            for fld in fields:
+                if _get_name is None:
+                    # pcbnew's GetName/GetText always return str, so no None
+                    # guard is needed past this point; a build missing the
+                    # accessors is detected once, here, and the fields branch
+                    # is switched off for the rest of the board
                     try:
-                        del props[match_key]
-                    except Exception:
-                        pass
-
-                count_modified += 1
-                continue  # Done with this footprint, go to next
-        except AttributeError:
-            # This KiCad build does not expose GetProperties()
-            pass
-
-        # ---------- CASE B: Fields (textual named fields) ----------
-        try:
-            fields = fp.GetFields()  # Some builds may not support this either
-        except AttributeError:
-            fields = []
-
-        renamed_here = False
-        for fld in fields:
-            # Compare field names in lowercase
-            name = (getattr(fld, "GetName", lambda: "")() or "").strip().lower()
-            if name == old_l:
-                count_found += 1
-                try:
-                    # Try to rename directly in place
-                    fld.SetName(new_field)
-                except Exception:
-                    # Fallback: create a new property instead (so value is preserved)
+                        _get_name = type(fld).GetName
+                        _get_text = type(fld).GetText
+                    except AttributeError:
+                        has_fields = False
+                        break
+                # Compare field names case-insensitively
+                name_cf = _norm(_get_name(fld))
+                new_name = pending.get(name_cf)
+                if new_name is not None:
+                    count_found += 1
+                    if not frozen:
+                        frame = _freeze_main_frame()
+                        frozen = True
                     try:
-                        value = (getattr(fld, "GetText", lambda: "")() or "")
-                        fp.SetProperty(new_field, value)
+                        # Try to rename directly in place
+                        fld.SetName(new_name)
                     except Exception:
-                        pass
+                        # Fallback: create a new property instead (so value is preserved)
+                        try:
+                            value = _get_text(fld)
+                            fp.SetProperty(new_name, value)
+                        except Exception:
+                            pass
+                    field_done.add(name_cf)
+                    # No early break: later fields may duplicate an already
+                    # satisfied name and every occurrence must be renamed
+
+            if field_done and not prop_matches:
+                # Footprints changed in CASE A are already counted
                 count_modified += 1
-                renamed_here = True
-                break
+    finally:
+        if frame is not None:
+            try:
+                frame.Thaw()
+            except Exception:
+                pass
+
+        if count_modified:
+            # Mark the board dirty once for the whole pass instead of
+            # relying on implicit per-SetProperty marking
+            try:
+                board.SetModified()
+            except Exception:
+                pass
+
+            # Refresh PCB editor so changes are visible immediately
+            pcbnew.Refresh()
 
-        if renamed_here:
-            continue
-
-    # Refresh PCB editor so changes are visible immediately
-    pcbnew.Refresh()
     return count_modified, count_found
 
 
+def _rename_fields_on_board(board, old_field, new_field):
+    """
+    Rename old_field -> new_field on all footprints in the given board.
+
+    Single-rename convenience wrapper around _rename_many_on_board();
+    returns the same (count_modified, count_found) pair.
+    """
+    return _rename_many_on_board(board, {old_field or "": new_field})
+
+
 class _RenameDialog(wx.Dialog):
     """Simple dialog box asking for old/new field names."""
 
     def __init__(self, parent, default_old="OLDname", default_new="NEWname"):
         super().__init__(parent, title="Rename footprint field",
                          style=wx.DEFAULT_DIALOG_STYLE | wx.RESIZE_BORDER)
-        self.SetSize(wx.Size(420, 170))
+        self.SetSize(wx.Size(420, 300))
 
         s = wx.BoxSizer(wx.VERTICAL)
 
@@ -131,6 +269,12 @@ class _RenameDialog(wx.Dialog):
         row2.Add(self.txt_new, 1, wx.EXPAND)
         s.Add(row2, 0, wx.LEFT | wx.RIGHT | wx.BOTTOM | wx.EXPAND, 8)
 
+        # Optional extra renames, applied in the same board pass
+        s.Add(wx.StaticText(self, label="More renames (optional, one per line, OLD = NEW):"),
+              0, wx.LEFT | wx.RIGHT, 8)
+        self.txt_more = wx.TextCtrl(self, style=wx.TE_MULTILINE)
+        s.Add(self.txt_more, 1, wx.ALL | wx.EXPAND, 8)
+
         # OK/Cancel buttons
         btns = self.CreateSeparatedButtonSizer(wx.OK | wx.CANCEL)
         s.Add(btns, 0, wx.ALL | wx.EXPAND, 8)
@@ -142,6 +286,41 @@ class _RenameDialog(wx.Dialog):
         return (self.txt_old.GetValue().strip(),
                 self.txt_new.GetValue().strip())
 
+    def get_renames(self):
+        """
+        Parse every requested rename: the main old/new pair first, then one
+        entry per non-empty line of the "More renames" box ("OLD = NEW",
+        "OLD -> NEW" or "OLD, NEW").
+
+        Returns (renames, bad_lines): renames is an {old: new} dict and
+        bad_lines lists the lines that could not be parsed, so the caller
+        can warn instead of silently dropping them.
+        """
+        old_field, new_field = self.get_values()
+        renames = {}
+        bad_lines = []
+        if old_field and new_field:
+            renames[old_field] = new_field
+        for line in self.txt_more.GetValue().splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            for sep in ("->", "=", ","):
+                if sep in line:
+                    old, new = line.split(sep, 1)
+                    old = old.strip()
+                    new = new.strip()
+                    if old and new:
+                        renames[old] = new
+                    else:
+                        # Separator present but one side is empty
+                        bad_lines.append(line)
+                    break
+            else:
+                # No recognized separator at all
+                bad_lines.append(line)
+        return renames, bad_lines
+
 
 class RenameFieldPlugin(pcbnew.ActionPlugin):
     """KiCad Action Plugin wrapper for the rename function."""
@@ -166,24 +345,55 @@ class RenameFieldPlugin(pcbnew.ActionPlugin):
             dlg.Destroy()
             return
         old_field, new_field = dlg.get_values()
+        renames, bad_lines = dlg.get_renames()
         dlg.Destroy()
 
         # Basic checks
-        if not old_field or not new_field:
+        if bool(old_field) != bool(new_field):
+            # Exactly one of the two main fields was filled in
+            wx.MessageBox("Please fill both field names.",
+                          "Rename field", wx.ICON_WARNING)
+            return
+        if bad_lines:
+            wx.MessageBox(
+                "Could not parse these rename lines:\n"
+                + "\n".join(bad_lines)
+                + "\n\nUse OLD = NEW, OLD -> NEW or OLD, NEW.",
+                "Rename field", wx.ICON_WARNING)
+            return
+        if not renames:
             wx.MessageBox("Please fill both field names.",
                           "Rename field", wx.ICON_WARNING)
             return
-        if old_field.strip().lower() == new_field.strip().lower():
+        # Two old names normalizing to the same key (e.g. 'MPN' and 'mpn')
+        # would silently collapse to a single rename further down — refuse
+        # instead of applying only one of them
+        seen_cf = {}
+        for old in renames:
+            cf = _norm(old)
+            if cf in seen_cf:
+                wx.MessageBox(
+                    f"Conflicting renames: '{seen_cf[cf]}' and '{old}' are "
+                    "the same field name (matching is case-insensitive).",
+                    "Rename field", wx.ICON_WARNING)
+                return
+            seen_cf[cf] = old
+        # Drop pairs where old and new are the same name (no-ops)
+        renames = {old: new for old, new in renames.items()
+                   if _norm(old) != _norm(new)}
+        if not renames:
             wx.MessageBox("Old and new field names are identical.",
                           "Rename field", wx.ICON_WARNING)
             return
 
-        # Perform the renaming
-        modified, found = _rename_fields_on_board(board, old_field, new_field)
+        # Perform all renames in a single board pass
+        modified, found = _rename_many_on_board(board, renames)
 
         # Show summary
+        summary = ", ".join(f"'{old}' → '{new}'"
+                            for old, new in renames.items())
         wx.MessageBox(
-            f"Renamed {found} occurrence(s) of '{old_field}' → '{new_field}'.\n"
+            f"Renamed {found} occurrence(s) of {summary}.\n"
             f"Modified footprints: {modified}.",
             "Rename field", wx.ICON_INFORMATION
         )